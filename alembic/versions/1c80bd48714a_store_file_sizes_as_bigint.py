@@ -0,0 +1,54 @@
+"""Store file size columns as BigInteger
+
+Revision ID: 1c80bd48714a
+Revises: 3fd48fb33fca
+Create Date: 2026-10-15 07:18:41.093562
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1c80bd48714a'
+down_revision: Union[str, Sequence[str], None] = '3fd48fb33fca'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing values are numeric strings; empty strings become NULL.
+    op.alter_column('events', 'cover_image_file_size',
+               existing_type=sa.String(),
+               type_=sa.BigInteger(),
+               existing_nullable=True,
+               postgresql_using="NULLIF(cover_image_file_size, '')::bigint")
+    op.alter_column('photos', 'file_size',
+               existing_type=sa.String(),
+               type_=sa.BigInteger(),
+               existing_nullable=True,
+               postgresql_using="NULLIF(file_size, '')::bigint")
+    op.alter_column('users', 'avatar_file_size',
+               existing_type=sa.String(),
+               type_=sa.BigInteger(),
+               existing_nullable=True,
+               postgresql_using="NULLIF(avatar_file_size, '')::bigint")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('users', 'avatar_file_size',
+               existing_type=sa.BigInteger(),
+               type_=sa.String(),
+               existing_nullable=True)
+    op.alter_column('photos', 'file_size',
+               existing_type=sa.BigInteger(),
+               type_=sa.String(),
+               existing_nullable=True)
+    op.alter_column('events', 'cover_image_file_size',
+               existing_type=sa.BigInteger(),
+               type_=sa.String(),
+               existing_nullable=True)
@@ -0,0 +1,35 @@
+"""Add approved_photo_count to events
+
+Revision ID: a9d3f6b2c815
+Revises: f2c8e5a1d7b4
+Create Date: 2026-10-15 09:12:36.581940
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d3f6b2c815'
+down_revision: Union[str, Sequence[str], None] = 'f2c8e5a1d7b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('events', sa.Column('approved_photo_count', sa.Integer(), server_default='0', nullable=False))
+    # Backfill from the existing approved photos
+    op.execute(
+        """
+        UPDATE events SET approved_photo_count =
+            (SELECT COUNT(*) FROM photos WHERE photos.event_id = events.id AND photos.approved)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('events', 'approved_photo_count')
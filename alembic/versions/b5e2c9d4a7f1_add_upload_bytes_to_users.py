@@ -0,0 +1,42 @@
+"""Add upload_bytes counter to users
+
+Revision ID: b5e2c9d4a7f1
+Revises: 1c80bd48714a
+Create Date: 2026-10-15 07:25:41.903512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e2c9d4a7f1'
+down_revision: Union[str, Sequence[str], None] = '1c80bd48714a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('upload_bytes', sa.BigInteger(), server_default='0', nullable=False))
+    # Backfill from the existing photo, cover and avatar sizes
+    op.execute(
+        """
+        UPDATE users SET upload_bytes =
+            COALESCE((SELECT SUM(photos.file_size) FROM photos WHERE photos.uploaded_by = users.id), 0)
+            + COALESCE((SELECT SUM(events.cover_image_file_size) FROM events WHERE events.host_id = users.id), 0)
+            + COALESCE(users.avatar_file_size, 0)
+        """
+    )
+    # The per-user sums are no longer computed at request time
+    op.drop_index('ix_photos_uploaded_by_file_size', table_name='photos')
+    op.drop_index('ix_events_host_id_cover_image_file_size', table_name='events')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_events_host_id_cover_image_file_size', 'events', ['host_id', 'cover_image_file_size'], unique=False)
+    op.create_index('ix_photos_uploaded_by_file_size', 'photos', ['uploaded_by', 'file_size'], unique=False)
+    op.drop_column('users', 'upload_bytes')
@@ -0,0 +1,33 @@
+"""Add indexes for event listing and photo counts
+
+Revision ID: d81f4a6c2e93
+Revises: b5e2c9d4a7f1
+Create Date: 2026-10-15 07:31:08.274915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd81f4a6c2e93'
+down_revision: Union[str, Sequence[str], None] = 'b5e2c9d4a7f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY can't run inside a transaction; build without locking writes on Postgres
+    with op.get_context().autocommit_block():
+        op.create_index('ix_events_host_created', 'events', ['host_id', 'created_at'], unique=False, postgresql_concurrently=True)
+        op.create_index(op.f('ix_photos_event_id'), 'photos', ['event_id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_photos_event_id'), table_name='photos', postgresql_concurrently=True)
+        op.drop_index('ix_events_host_created', table_name='events', postgresql_concurrently=True)
@@ -0,0 +1,36 @@
+"""Add indexes for keyset pagination of photo listings
+
+Revision ID: e4a7c1b9d352
+Revises: d81f4a6c2e93
+Create Date: 2026-10-15 08:02:44.613527
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a7c1b9d352'
+down_revision: Union[str, Sequence[str], None] = 'd81f4a6c2e93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY can't run inside a transaction; build without locking writes on Postgres
+    with op.get_context().autocommit_block():
+        op.create_index('ix_photos_event_uploaded', 'photos', ['event_id', sa.text('uploaded_at DESC'), sa.text('id DESC')], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_photos_event_approved_uploaded', 'photos', ['event_id', 'approved', sa.text('uploaded_at DESC'), sa.text('id DESC')], unique=False, postgresql_concurrently=True)
+        # ix_photos_event_uploaded leads with event_id, so the single-column index is redundant
+        op.drop_index(op.f('ix_photos_event_id'), table_name='photos', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_photos_event_id'), 'photos', ['event_id'], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_photos_event_approved_uploaded', table_name='photos', postgresql_concurrently=True)
+        op.drop_index('ix_photos_event_uploaded', table_name='photos', postgresql_concurrently=True)
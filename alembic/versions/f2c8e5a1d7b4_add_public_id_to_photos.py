@@ -0,0 +1,35 @@
+"""Add Cloudinary public_id to photos
+
+Revision ID: f2c8e5a1d7b4
+Revises: e4a7c1b9d352
+Create Date: 2026-10-15 08:41:17.902364
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c8e5a1d7b4'
+down_revision: Union[str, Sequence[str], None] = 'e4a7c1b9d352'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('photos', sa.Column('public_id', sa.String(length=255), nullable=True))
+    # Backfill from the delivery URL: .../upload/[v<version>/]<public_id>.<ext>
+    op.execute(
+        r"""
+        UPDATE photos SET public_id = regexp_replace(regexp_replace(url, '\.[^./]*$', ''), '^.*/upload/(v[0-9]+/)?', '')
+        WHERE url LIKE '%/upload/%'
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('photos', 'public_id')
@@ -1,9 +1,12 @@
 """
 CRUD (Create, Read, Update, Delete) operations for database models.
 """
-from sqlalchemy.orm import Session
-from typing import Dict, Any
-from sqlalchemy import func, cast, Integer
+from sqlalchemy.orm import Session, Query
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from sqlalchemy import func, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime
+import base64
 import logging
 
 from app.models.user import User as UserModel
@@ -18,18 +21,19 @@ def get_or_create_user(db: Session, user_info: Dict[str, Any]) -> UserModel:
     """
     Retrieves a user from the database or creates a new one if they don't exist.
     """
-    # Check if a user with this email already exists
-    user = db.query(UserModel).filter(UserModel.email == user_info["email"]).first()
+    # Check if a user with this email already exists (served by the unique ix_users_email index)
+    user = db.scalar(select(UserModel).where(UserModel.email == user_info["email"]))
     
     if user:
         # User already exists, check if the UID matches
         if user.id != user_info["uid"]:
             # Log a warning if the UID is different
             logger.warning(f"User with email {user.email} already exists with a different UID.")
-        if user.name != user_info.get("name") and user_info.get("name") is not None:
-            user.name = user_info.get("name")
+        name = user_info.get("name")
+        if name is not None and user.name != name:
+            # Only write when the display name actually changed
+            user.name = name
             db.commit()
-            db.refresh(user)
         return user
     else:
         # User does not exist, create a new one
@@ -39,32 +43,130 @@ def get_or_create_user(db: Session, user_info: Dict[str, Any]) -> UserModel:
             name=user_info.get("name"),
         )
         db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
-        return db.query(UserModel).filter(UserModel.id == new_user.id).first()
+        try:
+            db.commit()
+        except IntegrityError:
+            # A concurrent request created the same user first; the unique email index rejected ours
+            db.rollback()
+            return db.scalars(select(UserModel).where(UserModel.email == user_info["email"])).one()
+        return new_user
 
 def get_user_upload_size(db: Session, user_id: str) -> int:
     """
-    Calculates the total upload size for a user in bytes.
+    Returns the total upload size for a user in bytes.
+    Read from the denormalized users.upload_bytes counter kept by the helpers below.
     """
-    total_size = 0
+    return db.scalar(select(UserModel.upload_bytes).where(UserModel.id == user_id)) or 0
 
-    # Sum of photo file sizes - cast string to integer for sum operation
-    photo_size = db.query(func.sum(cast(PhotoModel.file_size, Integer))).filter(PhotoModel.uploaded_by == user_id).scalar()
-    if photo_size:
-        total_size += photo_size
+def reserve_upload_bytes(db: Session, user_id: str, size: int, limit: int) -> bool:
+    """
+    Atomically adds `size` bytes to the user's upload total if it stays within `limit`.
+    The check and the increment are one conditional UPDATE, so concurrent uploads can't
+    both squeeze past the limit. Commits right away so the reservation is visible to
+    other requests. Returns False, reserving nothing, when the limit would be exceeded.
+    """
+    result = db.execute(
+        update(UserModel)
+        .where(UserModel.id == user_id, UserModel.upload_bytes + size <= limit)
+        .values(upload_bytes=UserModel.upload_bytes + size)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount == 1
 
-    # Sum of event cover image file sizes - cast string to integer for sum operation
-    event_cover_size = db.query(func.sum(cast(EventModel.cover_image_file_size, Integer))).join(UserModel).filter(UserModel.id == user_id).scalar()
-    if event_cover_size:
-        total_size += event_cover_size
+def release_upload_bytes(db: Session, user_id: Optional[str], size: Optional[int]) -> None:
+    """
+    Subtracts `size` bytes from the user's upload total.
+    Doesn't commit, so the release lands in the same transaction as the change that freed the space.
+    """
+    if not user_id or not size:
+        return
+    db.execute(
+        update(UserModel)
+        .where(UserModel.id == user_id)
+        .values(upload_bytes=UserModel.upload_bytes - size)
+        .execution_options(synchronize_session=False)
+    )
 
-    # User avatar size - cast string to integer
-    user = db.query(UserModel).filter(UserModel.id == user_id).first()
-    if user and user.avatar_file_size:
-        try:
-            total_size += int(user.avatar_file_size)
-        except (ValueError, TypeError):
-            pass  # Skip if conversion fails
+def release_photos_upload_bytes(db: Session, photos: Iterable[PhotoModel]) -> None:
+    """
+    Releases the upload bytes of the given photos, grouped by uploader. Doesn't commit.
+    Accepts Photo instances or any rows with uploaded_by and file_size columns.
+    """
+    freed: Dict[str, int] = {}
+    for photo in photos:
+        if photo.uploaded_by and photo.file_size:
+            freed[photo.uploaded_by] = freed.get(photo.uploaded_by, 0) + photo.file_size
+    for user_id, size in freed.items():
+        release_upload_bytes(db, user_id, size)
+
+def release_event_upload_bytes(db: Session, event: EventModel) -> None:
+    """
+    Releases the upload bytes of an event's cover image and all of its photos. Doesn't commit.
+    Photo sizes are summed in the database so the photos don't have to be loaded.
+    """
+    release_upload_bytes(db, event.host_id, event.cover_image_file_size)
+    photo_sizes = db.execute(
+        select(PhotoModel.uploaded_by, func.sum(PhotoModel.file_size))
+        .where(PhotoModel.event_id == event.id)
+        .group_by(PhotoModel.uploaded_by)
+    ).all()
+    for user_id, size in photo_sizes:
+        release_upload_bytes(db, user_id, size)
+
+def get_page_with_total(query: Query, offset: int, limit: int) -> Tuple[List[Any], int]:
+    """
+    Fetches one page of a single-entity query together with the total number of matching rows.
+    The total rides along on each row as a COUNT(*) OVER () window column, so both come back
+    in one round-trip; only a page past the end needs a separate COUNT.
+    """
+    rows = query.add_columns(func.count().over()).offset(offset).limit(limit).all()
+    if not rows:
+        return [], (query.count() if offset else 0)
+    return [item for item, _ in rows], rows[0][1]
 
-    return total_size
+
+def encode_photo_cursor(photo: PhotoModel) -> str:
+    """Encodes a photo's (uploaded_at, id) sort key as an opaque pagination cursor."""
+    return base64.urlsafe_b64encode(f"{photo.uploaded_at.isoformat()}|{photo.id}".encode()).decode()
+
+
+def decode_photo_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Decodes a cursor produced by encode_photo_cursor.
+    Raises ValueError if the cursor is malformed.
+    """
+    try:
+        uploaded_at, photo_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+    except Exception as e:
+        raise ValueError("Malformed cursor") from e
+    return datetime.fromisoformat(uploaded_at), photo_id
+
+
+def get_photo_keyset_page(query: Query, cursor: Optional[str], limit: int) -> Tuple[List[PhotoModel], Optional[str]]:
+    """
+    Fetches the page of photos that follows `cursor` in (uploaded_at DESC, id DESC) order.
+    Seeks straight to the cursor's position instead of skipping rows with OFFSET, so every
+    page costs the same regardless of depth. Returns the photos and the cursor for the next
+    page, or None when this is the last page.
+    """
+    if cursor is not None:
+        query = query.filter(tuple_(PhotoModel.uploaded_at, PhotoModel.id) < decode_photo_cursor(cursor))
+    # One extra row tells us whether another page follows
+    photos = query.limit(limit + 1).all()
+    if len(photos) <= limit:
+        return photos, None
+    photos = photos[:limit]
+    return photos, encode_photo_cursor(photos[-1])
+
+
+def adjust_approved_photo_count(db: Session, event_id: str, delta: int) -> None:
+    """
+    Atomically adds `delta` to the event's approved photo counter. Doesn't commit.
+    """
+    if delta:
+        db.execute(
+            update(EventModel)
+            .where(EventModel.id == event_id)
+            .values(approved_photo_count=EventModel.approved_photo_count + delta)
+        )
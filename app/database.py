@@ -1,24 +1,39 @@
 """
 Database session management for SQLAlchemy.
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
 
 # Create the SQLAlchemy engine
 engine = create_engine(
     settings.database_url,
     # connect_args={"check_same_thread": False} # Only needed for SQLite
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_pre_ping=True,  # Replace connections the server dropped while idle
+    pool_recycle=settings.db_pool_recycle_seconds,
 )
 
+if settings.debug:
+    @event.listens_for(engine, "checkout")
+    def _log_pool_checkout(dbapi_connection, connection_record, connection_proxy):
+        logger.info(f"DB pool checkout: {engine.pool.status()}")
+
 # Create a SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Objects stay loaded after commit: handlers build their responses from the values they just wrote,
+# and server-generated columns come back via RETURNING (eager_defaults), so no refresh is needed
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 # Create a Base class for ORM models
 Base = declarative_base()
 
-# Dependency to get a database session
+# Dependency to get a database session. The session (like the Cloudinary SDK and token
+# verification) is blocking, so routes that use it are plain `def` and run in FastAPI's threadpool.
 def get_db():
     """
     FastAPI dependency that provides a database session.
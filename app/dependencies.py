@@ -2,10 +2,21 @@
 FastAPI dependencies for authentication and authorization.
 """
 from fastapi import Depends, HTTPException, status, Header
+from fastapi.concurrency import run_in_threadpool
 from typing import Optional, Dict, Any
+from sqlalchemy.orm import Session
 
-from app.services.firebase import verify_firebase_token
-from app.config import settings # Moved import to top
+from app.services.firebase import get_cached_firebase_user, verify_firebase_token
+from app.database import get_db
+from app.crud import get_or_create_user
+from app.models.user import User as UserModel
+from app.services.ttl_cache import BoundedTTLCache
+
+# Cache of Firebase UID -> host user ID, so routes that only need the host's ID
+# can skip the user lookup. Users are never deleted, so a short TTL is plenty.
+_HOST_ID_CACHE_MAX_SIZE = 10_000
+_HOST_ID_CACHE_TTL_SECONDS = 300
+_host_id_cache: BoundedTTLCache[str] = BoundedTTLCache(_HOST_ID_CACHE_MAX_SIZE, _HOST_ID_CACHE_TTL_SECONDS)
 
 
 async def get_current_user(
@@ -35,23 +46,35 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Extract token from "Bearer <token>" format
-    try:
-        scheme, token = authorization.split()
-        if scheme.lower() != "bearer":
-            raise ValueError("Invalid authorization scheme")
-    except ValueError:
+    # Extract token from "Bearer <token>" format by slicing (no split/list allocation)
+    token = authorization[7:].strip() if authorization[:7].lower() == "bearer " else ""
+    if not token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authorization header format. Expected: 'Bearer <token>'", # Refined error message
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Verify token and return user info
-    user_info = verify_firebase_token(token)
+    # Verify token and return user info. Cache hits are a dict lookup; a miss means RSA
+    # verification (and possibly a certificate fetch), which runs off the event loop
+    user_info = get_cached_firebase_user(token)
+    if user_info is None:
+        user_info = await run_in_threadpool(verify_firebase_token, token)
     return user_info
 
 
+def require_admin(user_info: Dict[str, Any]) -> None:
+    """
+    Raises HTTPException (403 Forbidden) unless the verified user is a configured admin.
+    The `is_admin` flag is resolved by verify_firebase_token and cached with the token.
+    """
+    if not user_info.get("is_admin"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+
+
 async def get_current_admin_user(
     user: Dict[str, Any] = Depends(get_current_user)
 ) -> Dict[str, Any]:
@@ -72,13 +95,38 @@ async def get_current_admin_user(
     Returns:
         User info if admin, otherwise raises HTTPException (403 Forbidden)
     """
-    user_email = user.get("email")
-    
-    if not user_email or user_email not in settings.get_admin_emails_list():
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Admin access required"
-        )
-    
+    require_admin(user)
     return user
 
+
+def get_current_host(
+    user: Dict[str, Any] = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> UserModel:
+    """
+    FastAPI dependency that returns the database user for the authenticated host,
+    creating it on first use. FastAPI resolves it once per request.
+    
+    Usage:
+        @app.get("/me")
+        def profile(host: User = Depends(get_current_host)):
+            return {"uid": host.id}
+    """
+    host = get_or_create_user(db, user)
+    _host_id_cache.set(user["uid"], host.id)
+    return host
+
+
+def get_current_host_id(
+    user: Dict[str, Any] = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> str:
+    """
+    FastAPI dependency that returns only the authenticated host's user ID.
+    Served from an in-process cache when possible, so no query is issued;
+    falls back to get_current_host on a miss.
+    """
+    host_id = _host_id_cache.get(user["uid"])
+    if host_id is not None:
+        return host_id
+    return get_current_host(user, db).id
@@ -2,12 +2,15 @@
 FastAPI application entry point.
 """
 from fastapi import FastAPI, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from contextlib import asynccontextmanager
+from typing import Dict
 import logging
 
 from app.config import settings
-from app.services.firebase import initialize_firebase
+from app.services.firebase import initialize_firebase, warm_firebase_public_keys
 from app.routers import auth, admin_auth, photos, profiles, events, admin, public
 
 # Configure logging
@@ -17,23 +20,29 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Create FastAPI app
-app = FastAPI(
-    title="PhotoLog API",
-    description="Backend API for PhotoLog - Event photo sharing platform",
-    version="1.0.0"
-)
-
 # Initialize Firebase Admin SDK on startup
-@app.on_event("startup")
-async def startup_event():
+@asynccontextmanager
+async def lifespan(app: FastAPI):
     """Initialize Firebase Admin SDK when application starts."""
     try:
-        initialize_firebase()
+        # Reading the credentials file is blocking I/O, keep it off the event loop
+        await run_in_threadpool(initialize_firebase)
+        # Fetch token signing keys now instead of on the first authenticated request
+        await run_in_threadpool(warm_firebase_public_keys)
         logger.info("Application started successfully")
     except Exception as e:
         logger.error(f"Failed to start application: {e}")
         raise
+    yield
+
+
+# Create FastAPI app
+app = FastAPI(
+    title="PhotoLog API",
+    description="Backend API for PhotoLog - Event photo sharing platform",
+    version="1.0.0",
+    lifespan=lifespan
+)
 
 
 # Configure CORS
@@ -62,7 +71,7 @@ app.include_router(public.router)
 
 # Health check endpoint
 @app.get("/health")
-async def health_check():
+async def health_check() -> Dict[str, str]:
     """Basic service health check."""
     return {
         "status": "healthy",
@@ -72,7 +81,7 @@ async def health_check():
 
 # Root endpoint
 @app.get("/")
-async def root():
+async def root() -> Dict[str, str]:
     """Root endpoint."""
     return {
         "message": "PhotoLog API",
@@ -82,9 +91,29 @@ async def root():
 
 
 # Exception handlers
+
+# Pre-rendered bodies for the most frequent (status_code, detail) pairs, mostly auth failures
+_PRERENDERED_ERROR_BODIES = {
+    (status_code, detail): JSONResponse(content={"detail": detail, "status_code": status_code}).body
+    for status_code, detail in (
+        (status.HTTP_401_UNAUTHORIZED, "Authorization header missing"),
+        (status.HTTP_401_UNAUTHORIZED, "Invalid authorization header format. Expected: 'Bearer <token>'"),
+        (status.HTTP_401_UNAUTHORIZED, "Invalid authentication token"),
+        (status.HTTP_401_UNAUTHORIZED, "Authentication token has expired"),
+        (status.HTTP_401_UNAUTHORIZED, "Authentication token has been revoked"),
+        (status.HTTP_401_UNAUTHORIZED, "Incorrect password."),
+        (status.HTTP_403_FORBIDDEN, "Admin access required"),
+    )
+}
+
+
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc: HTTPException):
     """Handle HTTP exceptions."""
+    if isinstance(exc.detail, str):
+        body = _PRERENDERED_ERROR_BODIES.get((exc.status_code, exc.detail))
+        if body is not None:
+            return Response(content=body, status_code=exc.status_code, media_type="application/json")
     return JSONResponse(
         status_code=exc.status_code,
         content={
@@ -7,7 +7,7 @@ from typing import Optional
 
 class TokenRequest(BaseModel):
     """Request model for endpoints that receive Firebase ID token."""
-    token: str = Field(..., description="Firebase ID token provided by the client after authentication.")
+    token: str = Field(..., strict=True, description="Firebase ID token provided by the client after authentication.")
 
 
 class UserResponse(BaseModel):
@@ -29,7 +29,7 @@ class SigninResponse(BaseModel):
 
 class VerifyEmailRequest(BaseModel):
     """Request model for email verification."""
-    token: str = Field(..., description="Firebase ID token after email verification, indicating the email is now verified.")
+    token: str = Field(..., strict=True, description="Firebase ID token after email verification, indicating the email is now verified.")
 
 
 class ForgotPasswordRequest(BaseModel):
@@ -39,7 +39,7 @@ class ForgotPasswordRequest(BaseModel):
 
 class ResetPasswordRequest(BaseModel):
     """Request model for password reset."""
-    token: str = Field(..., description="Firebase ID token obtained after a successful password reset operation.")
+    token: str = Field(..., strict=True, description="Firebase ID token obtained after a successful password reset operation.")
 
 
 class UpdateProfileRequest(BaseModel):
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional, List
 from pydantic import BaseModel, Field
-from sqlalchemy import Column, String, DateTime, func, Boolean, ForeignKey, Text
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, func, Boolean, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -18,15 +18,24 @@ class Event(Base):
     password = Column(String, nullable=True)
     cover_image_url = Column(String, nullable=True)
     cover_thumbnail_url = Column(String, nullable=True)
-    cover_image_file_size = Column(String, nullable=True)
+    cover_image_file_size = Column(BigInteger, nullable=True)
     is_active = Column(Boolean, default=True, nullable=False)
     is_archived = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Kept in step with photo approvals and deletions (see crud.adjust_approved_photo_count)
+    approved_photo_count = Column(Integer, default=0, server_default="0", nullable=False)
 
     host = relationship("User", back_populates="events")
     photos = relationship("Photo", back_populates="event", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Serves the host's event list, which is filtered by host and ordered by creation time
+        Index("ix_events_host_created", "host_id", "created_at"),
+    )
+    # Fetch server-generated created_at/updated_at with RETURNING on flush, so they're loaded without a refresh
+    __mapper_args__ = {"eager_defaults": True}
+
 # Pydantic Models
 class EventBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=100, description="The name of the event.")
@@ -95,5 +104,5 @@ class MessageResponse(BaseModel):
 
 class BulkActionRequest(BaseModel):
     """Model for performing bulk actions on events."""
-    event_ids: List[str] = Field(..., description="A list of event IDs to perform the action on.")
+    event_ids: List[str] = Field(..., max_length=1000, description="A list of event IDs to perform the action on (at most 1000).")
     action: str = Field(..., description="The action to perform (e.g., 'archive', 'activate', 'deactivate').")
@@ -4,7 +4,7 @@ Pydantic and SQLAlchemy models for photo-related operations.
 from pydantic import BaseModel, Field, EmailStr
 from typing import Optional, List
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, func, Boolean, ForeignKey, Text
+from sqlalchemy import Column, String, BigInteger, DateTime, func, Boolean, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -14,7 +14,7 @@ class Photo(Base):
     __tablename__ = "photos"
 
     id = Column(String, primary_key=True, index=True)
-    event_id = Column(String, ForeignKey("events.id"), nullable=False)
+    event_id = Column(String, ForeignKey("events.id"), nullable=False) # Indexed by ix_photos_event_uploaded below
     url = Column(String, nullable=False)
     thumbnail_url = Column(String, nullable=True)
     caption = Column(Text, nullable=True)
@@ -22,10 +22,17 @@ class Photo(Base):
     uploaded_at = Column(DateTime(timezone=True), server_default=func.now())
     uploaded_by = Column(String, nullable=True) # Stores the host's ID for public uploads, or the user's ID for authenticated uploads.
     public_uploader_identifier = Column(String, nullable=True) # Unique identifier for anonymous public uploader
-    file_size = Column(String, nullable=True)
+    file_size = Column(BigInteger, nullable=True)
+    public_id = Column(String(255), nullable=True) # Cloudinary public ID, used to delete the image. Null for photos uploaded before it was recorded.
 
     event = relationship("Event", back_populates="photos")
 
+    __table_args__ = (
+        # Keyset pagination of host and public photo listings
+        Index("ix_photos_event_uploaded", "event_id", uploaded_at.desc(), id.desc()),
+        Index("ix_photos_event_approved_uploaded", "event_id", "approved", uploaded_at.desc(), id.desc()),
+    )
+
 # Pydantic Models
 class UpdatePhotoRequest(BaseModel):
     """Request to update photo metadata."""
@@ -59,7 +66,8 @@ class PhotoResponse(BaseModel):
 class PhotoListResponse(BaseModel):
     """Paginated list of photos."""
     photos: List[PhotoResponse] = Field(..., description="The list of photos for the current page.")
-    total: int = Field(..., description="The total number of photos matching the criteria.")
+    total: Optional[int] = Field(None, description="The total number of photos matching the criteria. Omitted (null) on cursor pages; take it from the first page.")
     page: int = Field(..., description="The current page number.")
     page_size: int = Field(..., description="The number of photos per page.")
-    has_more: bool = Field(..., description="Indicates if there are more pages of photos available.")
\ No newline at end of file
+    has_more: bool = Field(..., description="Indicates if there are more pages of photos available.")
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for fetching the next page, if there is one.")
\ No newline at end of file
@@ -1,7 +1,7 @@
 """
 Pydantic and SQLAlchemy models for user-related operations.
 """
-from sqlalchemy import Column, String, DateTime, func, Boolean
+from sqlalchemy import Column, String, BigInteger, DateTime, func, Boolean
 from sqlalchemy.orm import relationship
 from pydantic import BaseModel, Field, EmailStr
 from typing import Optional, List
@@ -18,7 +18,9 @@ class User(Base):
     name = Column(String, nullable=True)
     avatar_url = Column(String, nullable=True)
     avatar_thumbnail_url = Column(String, nullable=True)
-    avatar_file_size = Column(String, nullable=True)
+    avatar_file_size = Column(BigInteger, nullable=True)
+    # Running total of photo, cover and avatar bytes, enforced atomically (see crud.reserve_upload_bytes)
+    upload_bytes = Column(BigInteger, default=0, server_default="0", nullable=False)
     is_admin = Column(Boolean, default=False, nullable=False)
     is_suspended = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -26,6 +28,9 @@ class User(Base):
 
     events = relationship("Event", back_populates="host")
 
+    # Fetch server-generated created_at/updated_at with RETURNING on flush, so they're loaded without a refresh
+    __mapper_args__ = {"eager_defaults": True}
+
 # Pydantic Models
 class UserProfile(BaseModel):
     """User profile model (from Firebase token for now)."""
@@ -2,11 +2,12 @@
 Admin Dashboard router - handles all /admin/* endpoints.
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.concurrency import run_in_threadpool
 from typing import Dict, Any, List
 from datetime import datetime
 import uuid
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
+from sqlalchemy import func, select
 
 from app.dependencies import get_current_admin_user
 from app.models.admin import (
@@ -24,7 +25,9 @@ from app.models.event import EventUpdate, Event as EventModel
 from app.models.user import UserProfile, User as UserModel
 from app.models.photo import Photo as PhotoModel
 from app.database import get_db
-from app.services.cloudinary import delete_image
+from app.services.cloudinary import delete_images, public_id_from_url
+from app.crud import release_event_upload_bytes
+from app.services.event_cache import invalidate_host_events
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -42,11 +45,11 @@ async def get_overview_stats(
     total_users = db.query(UserModel).count()
     total_photos = db.query(PhotoModel).count()
     
-    # Calculate total storage from photos and event covers
-    total_photo_storage = db.query(func.sum(PhotoModel.file_size)).scalar() or 0
-    total_cover_storage = db.query(func.sum(EventModel.cover_image_file_size)).scalar() or 0
-    total_storage_bytes = total_photo_storage + total_cover_storage
-    total_storage_gb = round(total_storage_bytes / (1024**3), 4) if total_storage_bytes else 0
+    # Calculate total storage from photos and event covers (coalesced in SQL, never NULL)
+    total_photo_storage = select(func.coalesce(func.sum(PhotoModel.file_size), 0)).scalar_subquery()
+    total_cover_storage = select(func.coalesce(func.sum(EventModel.cover_image_file_size), 0)).scalar_subquery()
+    total_storage_bytes = db.execute(select(total_photo_storage + total_cover_storage)).scalar_one()
+    total_storage_gb = round(total_storage_bytes / (1024**3), 4)
 
     return OverviewStats(
         total_events=total_events,
@@ -132,9 +135,10 @@ async def update_event_status(
         if key in ["is_active", "is_archived"] and value is not None:
             setattr(event, key, value)
     event.updated_at = datetime.utcnow() # Manually update timestamp
+    host_id = event.host_id
     
     db.commit()
-    db.refresh(event)
+    invalidate_host_events(host_id)
 
     host_profile = UserProfile(
         uid=event.host.id,
@@ -158,25 +162,22 @@ async def force_delete_event(
     if not event:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
         
-    # Delete all photos associated with the event from Cloudinary
-    for photo in event.photos:
-        try:
-            public_id = "/".join(photo.url.split('/')[-2:]).split('.')[0]
-            delete_image(public_id)
-        except Exception as e:
-            # Log the error but continue with other deletions
-            print(f"Could not delete photo {photo.id} from Cloudinary: {e}")
-            
-    # Delete the event's cover image from Cloudinary
+    # Delete the event's photos and cover image from Cloudinary in batched calls
+    public_ids = [photo.public_id or public_id_from_url(photo.url) for photo in event.photos]
     if event.cover_image_url:
+        public_ids.append(public_id_from_url(event.cover_image_url))
+    if public_ids:
         try:
-            public_id = "/".join(event.cover_image_url.split('/')[-2:]).split('.')[0]
-            delete_image(public_id)
+            await run_in_threadpool(delete_images, public_ids)
         except Exception as e:
-            print(f"Could not delete cover image for event {event.id} from Cloudinary: {e}")
+            # Log the error but still delete the event
+            print(f"Could not delete images for event {event.id} from Cloudinary: {e}")
 
+    host_id = event.host_id
+    release_event_upload_bytes(db, event)
     db.delete(event)
     db.commit()
+    invalidate_host_events(host_id)
     
     return MessageResponse(message=f"Event '{event_id}' has been force-deleted.")
 
@@ -227,15 +228,22 @@ async def list_all_users(
     offset = (page - 1) * page_size
     users = query.offset(offset).limit(page_size).all()
 
+    # One GROUP BY for the whole page instead of a COUNT per user
+    event_counts = dict(
+        db.query(EventModel.host_id, func.count(EventModel.id))
+        .filter(EventModel.host_id.in_([user_obj.id for user_obj in users]))
+        .group_by(EventModel.host_id)
+        .all()
+    ) if users else {}
+
     admin_users = []
     for user_obj in users:
-        event_count = db.query(EventModel).filter(EventModel.host_id == user_obj.id).count()
         admin_users.append(AdminUserResponse(
             uid=user_obj.id,
             email=user_obj.email,
             name=user_obj.name,
             email_verified=True, # Assuming verified for existing users
-            event_count=event_count,
+            event_count=event_counts.get(user_obj.id, 0),
             is_suspended=user_obj.is_suspended
         ))
     
@@ -287,7 +295,6 @@ async def update_user_status(
         
     user_obj.is_suspended = is_suspended
     db.commit()
-    db.refresh(user_obj)
     
     event_count = db.query(EventModel).filter(EventModel.host_id == user_obj.id).count()
     
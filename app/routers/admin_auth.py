@@ -1,19 +1,21 @@
 """
 Admin authentication router - handles all /admin/auth/* endpoints.
 """
-from fastapi import APIRouter, Depends, HTTPException, status # Moved HTTPException, status import to top
+from fastapi import APIRouter, Depends, HTTPException, status
 from typing import Dict, Any
 
 from app.models.auth import TokenRequest, SigninResponse, UserResponse, MessageResponse
-from app.dependencies import get_current_admin_user
+from app.dependencies import get_current_admin_user, require_admin
 from app.services.firebase import verify_firebase_token
-from app.config import settings # Moved settings import to top
 
 router = APIRouter(prefix="/admin/auth", tags=["admin-auth"])
 
+# Static response built once at import instead of on every request
+_SIGNED_OUT_RESPONSE = MessageResponse(message="Signed out successfully")
+
 
 @router.post("/signin", response_model=SigninResponse)
-async def admin_signin(request: TokenRequest):
+def admin_signin(request: TokenRequest):
     """
     Admin login - verify Firebase token and check admin role.
     
@@ -29,12 +31,7 @@ async def admin_signin(request: TokenRequest):
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user_email = user_info.get("email")
-    if not user_email or user_email not in settings.get_admin_emails_list():
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Admin access required"
-        )
+    require_admin(user_info)
     
     user_response = UserResponse(
         uid=user_info["uid"],
@@ -57,11 +54,11 @@ async def admin_signout():
     Frontend handles Firebase signout (revokes token client-side).
     Backend just returns success.
     """
-    return MessageResponse(message="Signed out successfully")
+    return _SIGNED_OUT_RESPONSE
 
 
 @router.post("/refresh", response_model=SigninResponse)
-async def admin_refresh(
+def admin_refresh(
     request: TokenRequest,
     admin: Dict[str, Any] = Depends(get_current_admin_user) # get_current_admin_user already verifies admin role
 ):
@@ -1,8 +1,8 @@
 """
 Authentication router - handles all /auth/* endpoints.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import Dict, Any
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from typing import Dict, Any, Optional
 from sqlalchemy.orm import Session
 import logging
 
@@ -24,77 +24,92 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+# Static responses are built once at import instead of on every request
+_SIGNED_OUT_RESPONSE = MessageResponse(message="Signed out successfully")
+_EMAIL_VERIFIED_RESPONSE = MessageResponse(message="Email verified successfully")
+_VERIFICATION_SENT_RESPONSE = MessageResponse(message="Verification email sent")
+_PASSWORD_RESET_RESPONSE = MessageResponse(message="Password reset successfully")
 
-@router.post("/signup", response_model=SigninResponse)
-async def signup(request: TokenRequest, db: Session = Depends(get_db)):
+
+def _verify_token(token: str, action: str) -> Dict[str, Any]:
     """
-    Register a new host user.
-    
-    Verifies the Firebase token and creates a corresponding user in the database if one doesn't already exist.
+    Verify a Firebase ID token, reporting any failure as a 401 that names the action.
     """
     try:
-        user_info = verify_firebase_token(request.token)
+        return verify_firebase_token(token)
     except HTTPException as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=f"Invalid token during signup: {e.detail}",
+            detail=f"Invalid token during {action}: {e.detail}",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+
+def _build_signin_response(
+    token: str,
+    uid: str,
+    email: Optional[str],
+    email_verified: bool,
+    name: Optional[str],
+) -> SigninResponse:
+    """
+    Build the signin response shared by the signup, signin and refresh routes.
+    """
+    user_response = UserResponse(
+        uid=uid,
+        email=email,
+        email_verified=email_verified,
+        name=name,
+    )
+    return SigninResponse(token=token, user=user_response)
+
+
+@router.post("/signup", response_model=SigninResponse)
+def signup(request: TokenRequest, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+    """
+    Register a new host user.
+    
+    Verifies the Firebase token and creates a corresponding user in the database if one doesn't already exist.
+    """
+    user_info = _verify_token(request.token, "signup")
     
     user = get_or_create_user(db, user_info)
     
-    # Send welcome email (non-blocking)
-    try:
-        email_service.send_welcome_email(
-            user_email=user.email,
-            user_name=user.name
-        )
-    except Exception as e:
-        logger.warning(f"Failed to send welcome email to {user.email}: {e}")
+    # Send welcome email after the response goes out; email_service logs its own failures
+    background_tasks.add_task(
+        email_service.send_welcome_email,
+        user_email=user.email,
+        user_name=user.name
+    )
     
-    user_response = UserResponse(
+    return _build_signin_response(
+        request.token,
         uid=user.id,
         email=user.email,
-        email_verified=user_info.get("email_verified", False), 
+        email_verified=user_info.get("email_verified", False),
         name=user.name,
     )
-    
-    return SigninResponse(
-        token=request.token,
-        user=user_response
-    )
 
 
 @router.post("/signin", response_model=SigninResponse)
-async def signin(request: TokenRequest, db: Session = Depends(get_db)):
+def signin(request: TokenRequest, db: Session = Depends(get_db)):
     """
     Host login - verifies Firebase token and ensures user exists in the database.
     
     If the user doesn't exist in the local database (e.g., first sign-in with a social provider),
     a new user record is created.
     """
-    try:
-        user_info = verify_firebase_token(request.token)
-    except HTTPException as e:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=f"Invalid token during signin: {e.detail}",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    user_info = _verify_token(request.token, "signin")
     
     user = get_or_create_user(db, user_info)
     
-    user_response = UserResponse(
+    return _build_signin_response(
+        request.token,
         uid=user.id,
         email=user.email,
         email_verified=user_info.get("email_verified", False),
         name=user.name,
     )
-    
-    return SigninResponse(
-        token=request.token,
-        user=user_response
-    )
 
 
 @router.post("/signout", response_model=MessageResponse)
@@ -105,54 +120,36 @@ async def signout():
     Frontend handles Firebase signout (revokes token client-side).
     Backend just returns success. No token invalidation logic needed on backend if using JWTs.
     """
-    return MessageResponse(message="Signed out successfully")
+    return _SIGNED_OUT_RESPONSE
 
 
 @router.post("/refresh", response_model=SigninResponse)
-async def refresh(request: TokenRequest):
+def refresh(request: TokenRequest):
     """
     Refresh authentication token.
     
     Frontend gets new token from Firebase, backend verifies it.
     """
-    try:
-        user_info = verify_firebase_token(request.token)
-    except HTTPException as e:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=f"Invalid token during refresh: {e.detail}",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    user_info = _verify_token(request.token, "refresh")
     
-    user_response = UserResponse(
+    return _build_signin_response(
+        request.token,
         uid=user_info["uid"],
         email=user_info.get("email"),
         email_verified=user_info.get("email_verified", False),
         name=user_info.get("name"),
     )
-    
-    return SigninResponse(
-        token=request.token,
-        user=user_response
-    )
 
 
 @router.post("/verify-email", response_model=MessageResponse)
-async def verify_email_confirm(request: VerifyEmailRequest): # Renamed to avoid confusion with local variable
+def verify_email_confirm(request: VerifyEmailRequest): # Renamed to avoid confusion with local variable
     """
     Confirm email verification status.
     
     Frontend handles email verification flow with Firebase.
     Backend receives a token (after Firebase has marked email as verified) and confirms verification.
     """
-    try:
-        user_info = verify_firebase_token(request.token)
-    except HTTPException as e:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=f"Invalid token during email verification: {e.detail}",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    user_info = _verify_token(request.token, "email verification")
     
     # TODO: Update user's email_verified status in database if applicable
     # For now, we assume the token already contains the updated status
@@ -163,7 +160,7 @@ async def verify_email_confirm(request: VerifyEmailRequest): # Renamed to avoid
             detail="Email is not marked as verified in the provided token."
         )
 
-    return MessageResponse(message="Email verified successfully")
+    return _EMAIL_VERIFIED_RESPONSE
 
 
 @router.post("/resend-verification", response_model=MessageResponse)
@@ -175,7 +172,7 @@ async def resend_verification_link(): # Renamed for clarity
     Backend just acknowledges the request.
     """
     # TODO: Optionally, add rate limiting or user-specific logic if desired.
-    return MessageResponse(message="Verification email sent")
+    return _VERIFICATION_SENT_RESPONSE
 
 
 @router.post("/forgot-password", response_model=MessageResponse)
@@ -191,22 +188,15 @@ async def forgot_password_request(request: ForgotPasswordRequest): # Renamed for
 
 
 @router.post("/reset-password", response_model=MessageResponse)
-async def reset_password_confirm(request: ResetPasswordRequest): # Renamed for clarity
+def reset_password_confirm(request: ResetPasswordRequest): # Renamed for clarity
     """
     Confirm password reset and set new password after a successful reset on the frontend.
     
     Frontend handles password reset with Firebase.
     Backend receives new token after reset and verifies it.
     """
-    try:
-        user_info = verify_firebase_token(request.token)
-    except HTTPException as e:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=f"Invalid token during password reset confirmation: {e.detail}",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    user_info = _verify_token(request.token, "password reset confirmation")
     
     # TODO: Optionally, update any relevant database fields if needed after password reset.
     
-    return MessageResponse(message="Password reset successfully")
+    return _PASSWORD_RESET_RESPONSE
@@ -1,14 +1,18 @@
 """
 Events router - handles all /events/* endpoints for host management.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query, File, UploadFile, Response
-from typing import Dict, Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, File, UploadFile, Request, Response
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
+from functools import lru_cache
+import hashlib
 import uuid
+from uuid6 import uuid7
 import io
-import qrcode
-from sqlalchemy.orm import Session
-from app.dependencies import get_current_user
+import segno
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session, defer, raiseload
+from app.dependencies import get_current_user, get_current_host_id
 
 from app.models.event import (
     EventCreate,
@@ -19,16 +23,31 @@ from app.models.event import (
     BulkActionRequest,
     Event as EventModel,
 )
-from app.crud import get_or_create_user
+from app.models.photo import Photo as PhotoModel
 from app.database import get_db
-from app.dependencies import get_current_user
-from app.services.cloudinary import upload_image
-from app.crud import get_user_upload_size
+from app.services.cloudinary import upload_image, get_upload_size
+from app.crud import get_user_upload_size, reserve_upload_bytes, release_upload_bytes, release_event_upload_bytes
 import cloudinary
 from app.config import settings
+from app.services.event_cache import (
+    get_host_version,
+    get_cached_event_body,
+    cache_event_body,
+    invalidate_host_events,
+)
 
 router = APIRouter(prefix="/events", tags=["events"])
 
+# Column values set by each bulk action
+_BULK_ACTIONS: Dict[str, Dict[str, bool]] = {
+    "archive": {"is_archived": True},
+    "activate": {"is_active": True},
+    "deactivate": {"is_active": False},
+}
+
+# Settings are fixed for the life of the process, so the share link prefix is built once
+_EVENT_URL_PREFIX = settings.frontend_url.rstrip('/') + "/event/"
+
 # --- Helper Functions ---
 
 def generate_share_link(event_id: str) -> str:
@@ -38,15 +57,12 @@ def generate_share_link(event_id: str) -> str:
     """
     # For now, using event ID as slug
     # In the future, this could use a proper slug field
-    base_url = settings.frontend_url.rstrip('/')
-    return f"{base_url}/event/{event_id}"
+    return _EVENT_URL_PREFIX + event_id
 
 def event_to_response(event: EventModel, db: Session = None, photo_count: int = None) -> EventResponse:
     """
     Convert an Event model to EventResponse with computed fields.
     """
-    from app.models.photo import Photo as PhotoModel
-    
     # Count photos if not provided
     if photo_count is None:
         if db:
@@ -77,13 +93,28 @@ def event_to_response(event: EventModel, db: Session = None, photo_count: int =
         "share_link": generate_share_link(event.id)
     }
     
-    return EventResponse(**response_dict)
+    # Every value comes straight from the database row, so skip re-validating it
+    return EventResponse.model_construct(**response_dict)
 
-def verify_event_ownership(db: Session, event_id: str, user_id: str) -> EventModel:
+def _photo_count_column():
     """
-    Verify that the current user owns the event.
+    Correlated COUNT of an event's photos, selected alongside the event row
+    so the count never needs its own query or a load of the photos collection.
+    Counting rows rather than ids lets it be answered from ix_photos_event_id alone.
+    """
+    return (
+        select(func.count())
+        .select_from(PhotoModel)
+        .where(PhotoModel.event_id == EventModel.id)
+        .correlate(EventModel)
+        .scalar_subquery()
+        .label("photo_count")
+    )
+
+def check_event_ownership(event: Optional[EventModel], event_id: str, user_id: str) -> EventModel:
+    """
+    Raise 404 if the event doesn't exist and 403 if it belongs to another host.
     """
-    event = db.query(EventModel).filter(EventModel.id == event_id).first()
     if not event:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -96,61 +127,126 @@ def verify_event_ownership(db: Session, event_id: str, user_id: str) -> EventMod
         )
     return event
 
+def verify_event_ownership(db: Session, event_id: str, user_id: str, with_details: bool = False) -> EventModel:
+    """
+    Verify that the current user owns the event.
+    The wide `description` and `password` columns are only loaded when `with_details` is set,
+    i.e. when the caller is going to render the full event.
+    """
+    query = db.query(EventModel)
+    if not with_details:
+        query = query.options(defer(EventModel.description), defer(EventModel.password))
+    event = query.filter(EventModel.id == event_id).first()
+    return check_event_ownership(event, event_id, user_id)
+
+def get_owned_event_with_photo_count(db: Session, event_id: str, user_id: str) -> Tuple[EventModel, int]:
+    """
+    Verify ownership and fetch the event together with its photo count in one query.
+    The photos collection is set to raise if touched, so rendering the event can't
+    silently lazy-load every photo row.
+    """
+    row = (
+        db.query(EventModel, _photo_count_column())
+        .options(raiseload(EventModel.photos))
+        .filter(EventModel.id == event_id)
+        .first()
+    )
+    event, photo_count = row if row else (None, 0)
+    return check_event_ownership(event, event_id, user_id), photo_count
+
+@lru_cache(maxsize=1024)
+def _render_qr(event_id: str, size: int) -> Tuple[bytes, str]:
+    """
+    Render the QR code PNG for an event's share link, along with its ETag.
+    The output only depends on the event ID and box size, so it is rendered
+    once per pair and served from memory afterwards.
+    """
+    # Encode the share link; segno writes the PNG itself, without going through Pillow
+    qr = segno.make(generate_share_link(event_id), error="l", micro=False)
+    img_bytes = io.BytesIO()
+    qr.save(img_bytes, kind="png", scale=size, border=4)
+    png_bytes = img_bytes.getvalue()
+    
+    etag = f'"{hashlib.blake2b(png_bytes, digest_size=8).hexdigest()}"'
+    return png_bytes, etag
+
+def _render_event_list(db: Session, host_id: str, page: int, page_size: int) -> EventListResponse:
+    """
+    Query one page of the host's events and build the list response.
+    """
+    query = db.query(EventModel).filter(EventModel.host_id == host_id)
+    
+    # Photo counts and the total number of events come back with the page itself,
+    # instead of a COUNT per event plus a separate COUNT for the total
+    offset = (page - 1) * page_size
+    rows = (
+        query.add_columns(_photo_count_column(), func.count().over().label("total"))
+        .order_by(EventModel.created_at.desc(), EventModel.id)
+        .offset(offset)
+        .limit(page_size)
+        .all()
+    )
+    if rows:
+        total_events = rows[0].total
+    else:
+        # Past the last page the window has no rows to report on
+        total_events = query.count() if offset else 0
+    
+    # Convert events to response format with share links
+    event_responses = [event_to_response(event, photo_count=count) for event, count, _ in rows]
+    
+    return EventListResponse(
+        events=event_responses,
+        total=total_events,
+        page=page,
+        page_size=page_size,
+        has_more=(offset + len(rows)) < total_events
+    )
+
 # --- Endpoints ---
 
 @router.post("", response_model=EventResponse, status_code=status.HTTP_201_CREATED)
-async def create_event(
+def create_event(
     event_data: EventCreate,
-    user: Dict[str, Any] = Depends(get_current_user),
+    host_id: str = Depends(get_current_host_id),
     db: Session = Depends(get_db)
 ):
     """
     Create a new event. A unique ID will be generated for the event.
     """
-    host = get_or_create_user(db, user)
-    
-    new_event = EventModel(
-        id=str(uuid.uuid4()),
-        host_id=host.id,
-        **event_data.dict()
+    # INSERT ... RETURNING hands back server-generated columns like created_at,
+    # so no refresh query is needed after the insert.
+    # UUIDv7 ids are time-ordered, so new rows land at the end of the primary key index.
+    new_event = db.scalar(
+        insert(EventModel)
+        .values(id=str(uuid7()), host_id=host_id, **event_data.dict())
+        .returning(EventModel)
     )
-    db.add(new_event)
     db.commit()
-    db.refresh(new_event)
+    invalidate_host_events(host_id)
     
-    return event_to_response(new_event, db=db, photo_count=0)
+    return event_to_response(new_event, photo_count=0)
 
 @router.get("", response_model=EventListResponse)
-async def list_events(
+def list_events(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(10, ge=1, le=100, description="Items per page"),
-    user: Dict[str, Any] = Depends(get_current_user),
+    host_id: str = Depends(get_current_host_id),
     db: Session = Depends(get_db)
 ):
     """
     List all events created by the current host. Supports pagination.
+    With EVENT_CACHE_ENABLED, rendered pages are cached briefly and dropped whenever one of the host's events changes.
     """
-    host = get_or_create_user(db, user)
-    
-    query = db.query(EventModel).filter(EventModel.host_id == host.id)
-    total_events = query.count()
-    
-    offset = (page - 1) * page_size
-    events = query.offset(offset).limit(page_size).all()
-    
-    # Convert events to response format with share links
-    event_responses = [event_to_response(event, db=db) for event in events]
-    
-    return EventListResponse(
-        events=event_responses,
-        total=total_events,
-        page=page,
-        page_size=page_size,
-        has_more=(offset + len(events)) < total_events
-    )
+    version = get_host_version(host_id)
+    body = get_cached_event_body(host_id, version, "list", page, page_size)
+    if body is None:
+        body = _render_event_list(db, host_id, page, page_size).model_dump_json().encode()
+        cache_event_body(host_id, version, body, "list", page, page_size)
+    return Response(content=body, media_type="application/json")
 
 @router.get("/{event_id}", response_model=EventResponse)
-async def get_event_detail(
+def get_event_detail(
     event_id: str,
     user: Dict[str, Any] = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -158,11 +254,17 @@ async def get_event_detail(
     """
     Get detailed information for a specific event.
     """
-    event = verify_event_ownership(db, event_id, user["uid"])
-    return event_to_response(event, db=db)
+    # Only bodies for events the user owns are ever cached under their uid
+    version = get_host_version(user["uid"])
+    body = get_cached_event_body(user["uid"], version, "detail", event_id)
+    if body is None:
+        event, photo_count = get_owned_event_with_photo_count(db, event_id, user["uid"])
+        body = event_to_response(event, photo_count=photo_count).model_dump_json().encode()
+        cache_event_body(user["uid"], version, body, "detail", event_id)
+    return Response(content=body, media_type="application/json")
 
 @router.patch("/{event_id}", response_model=EventResponse)
-async def update_event_metadata(
+def update_event_metadata(
     event_id: str,
     event_data: EventUpdate,
     user: Dict[str, Any] = Depends(get_current_user),
@@ -172,19 +274,19 @@ async def update_event_metadata(
     Update the metadata for a specific event.
     Only provided fields will be updated.
     """
-    event = verify_event_ownership(db, event_id, user["uid"])
+    event, photo_count = get_owned_event_with_photo_count(db, event_id, user["uid"])
     
     update_data = event_data.dict(exclude_unset=True)
     for key, value in update_data.items():
         setattr(event, key, value)
         
     db.commit()
-    db.refresh(event)
+    invalidate_host_events(user["uid"])
     
-    return event_to_response(event, db=db)
+    return event_to_response(event, photo_count=photo_count)
 
 @router.delete("/{event_id}", response_model=MessageResponse)
-async def delete_event(
+def delete_event(
     event_id: str,
     user: Dict[str, Any] = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -196,13 +298,15 @@ async def delete_event(
     
     # Note: The 'photos' relationship has `cascade="all, delete-orphan"`,
     # so deleting the event will automatically delete its associated photos.
+    release_event_upload_bytes(db, event)
     db.delete(event)
     db.commit()
+    invalidate_host_events(user["uid"])
     
     return MessageResponse(message=f"Event '{event_id}' and all associated assets have been deleted.")
 
 @router.post("/{event_id}/cover", response_model=EventResponse)
-async def upload_event_cover_image(
+def upload_event_cover_image(
     event_id: str,
     file: UploadFile = File(...),
     user: Dict[str, Any] = Depends(get_current_user),
@@ -211,7 +315,7 @@ async def upload_event_cover_image(
     """
     Upload or replace the cover image for an event.
     """
-    event = verify_event_ownership(db, event_id, user["uid"])
+    event = verify_event_ownership(db, event_id, user["uid"], with_details=True)
 
     # Validate file type
     if not file.content_type or not file.content_type.startswith('image/'):
@@ -220,15 +324,18 @@ async def upload_event_cover_image(
             detail="File must be an image."
         )
 
-    # Read file content to get size
-    file_content = await file.read()
-    file_size = len(file_content)
-    await file.seek(0)  # Reset file pointer
+    # Size is known from the parsed upload; no need to read the file into memory
+    file_size = get_upload_size(file)
+    if file_size == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File is empty."
+        )
 
     # Check upload limit
     MAX_UPLOAD_SIZE_PER_USER = 1 * 1024 * 1024 * 1024  # 1GB
-    current_upload_size = get_user_upload_size(db, user["uid"])
-    if current_upload_size + file_size > MAX_UPLOAD_SIZE_PER_USER:
+    if not reserve_upload_bytes(db, user["uid"], file_size, MAX_UPLOAD_SIZE_PER_USER):
+        current_upload_size = get_user_upload_size(db, user["uid"])
         raise HTTPException(
             status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
             detail=f"Upload limit exceeded. You have {round(current_upload_size / (1024*1024*1024), 2)}GB uploaded. Max allowed is 1GB."
@@ -251,11 +358,17 @@ async def upload_event_cover_image(
                 {'width': 400, 'height': 400, 'crop': 'fill'}
             ]
         )
+        # The replaced cover no longer counts towards the quota
+        release_upload_bytes(db, event.host_id, event.cover_image_file_size)
         event.cover_image_file_size = file_size
         db.commit()
-        db.refresh(event)
+        invalidate_host_events(user["uid"])
         
     except Exception as e:
+        # Give back the bytes reserved for this upload
+        db.rollback()
+        release_upload_bytes(db, user["uid"], file_size)
+        db.commit()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"An error occurred during cover image upload: {str(e)}"
@@ -264,8 +377,9 @@ async def upload_event_cover_image(
     return event
 
 @router.get("/{event_id}/qr")
-async def get_event_qr_code(
+def get_event_qr_code(
     event_id: str,
+    request: Request,
     user: Dict[str, Any] = Depends(get_current_user),
     db: Session = Depends(get_db),
     size: int = Query(10, ge=1, le=20, description="QR code size (1-20, default 10)")
@@ -274,42 +388,22 @@ async def get_event_qr_code(
     Generate and retrieve a QR code for the event's public sharing link.
     Returns a PNG image of the QR code that can be scanned to access the event.
     """
-    event = verify_event_ownership(db, event_id, user["uid"])
-    
-    # Generate the share link
-    share_link = generate_share_link(event_id)
-    
-    # Create QR code instance
-    qr = qrcode.QRCode(
-        version=1,  # Controls the size of the QR code (1 is smallest)
-        error_correction=qrcode.constants.ERROR_CORRECT_L,  # Error correction level
-        box_size=size,  # Size of each box in pixels
-        border=4,  # Border thickness in boxes
-    )
-    
-    # Add data to QR code
-    qr.add_data(share_link)
-    qr.make(fit=True)
-    
-    # Create image from QR code
-    img = qr.make_image(fill_color="black", back_color="white")
+    verify_event_ownership(db, event_id, user["uid"])
     
-    # Convert image to bytes
-    img_bytes = io.BytesIO()
-    img.save(img_bytes, format='PNG')
-    img_bytes.seek(0)
+    png_bytes, etag = _render_qr(event_id, size)
+    headers = {
+        "Cache-Control": "private, max-age=86400",
+        "ETag": etag,
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
     
     # Return image as response
-    return Response(
-        content=img_bytes.getvalue(),
-        media_type="image/png",
-        headers={
-            "Content-Disposition": f'inline; filename="event-{event_id}-qr.png"'
-        }
-    )
+    headers["Content-Disposition"] = f'inline; filename="event-{event_id}-qr.png"'
+    return Response(content=png_bytes, media_type="image/png", headers=headers)
 
 @router.post("/{event_id}/download", response_model=MessageResponse)
-async def trigger_event_photos_zip_export(
+def trigger_event_photos_zip_export(
     event_id: str,
     user: Dict[str, Any] = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -328,7 +422,7 @@ async def trigger_event_photos_zip_export(
     )
 
 @router.post("/actions/bulk", response_model=MessageResponse)
-async def bulk_actions_on_events(
+def bulk_actions_on_events(
     request: BulkActionRequest,
     user: Dict[str, Any] = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -336,26 +430,23 @@ async def bulk_actions_on_events(
     """
     Perform a bulk action (e.g., archive, activate) on multiple events at once.
     """
-    if request.action not in ["archive", "activate", "deactivate"]:
+    values = _BULK_ACTIONS.get(request.action)
+    if values is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid action '{request.action}'. Must be one of: archive, activate, deactivate."
         )
-        
-    query = db.query(EventModel).filter(
-        EventModel.id.in_(request.event_ids),
-        EventModel.host_id == user["uid"]
-    )
     
-    updated_count = 0
-    if request.action == "archive":
-        updated_count = query.update({"is_archived": True})
-    elif request.action == "activate":
-        updated_count = query.update({"is_active": True})
-    elif request.action == "deactivate":
-        updated_count = query.update({"is_active": False})
-        
+    # One UPDATE for every action; no need to sync in-session objects since none are loaded
+    result = db.execute(
+        update(EventModel)
+        .where(EventModel.id.in_(request.event_ids), EventModel.host_id == user["uid"])
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    updated_count = result.rowcount
     db.commit()
+    invalidate_host_events(user["uid"])
             
     return MessageResponse(
         message=f"Successfully performed action '{request.action}' on {updated_count} event(s)."
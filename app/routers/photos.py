@@ -1,9 +1,10 @@
 """
 Photos router - handles photo moderation endpoints for hosts and public uploads.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query, File, UploadFile
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, File, UploadFile
 from typing import Dict, Any, List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Query as SAQuery, Session, joinedload
 import uuid
 import logging
 
@@ -18,22 +19,104 @@ from app.models.photo import (
 from app.models.event import Event as EventModel
 from app.dependencies import get_current_user
 from app.database import get_db
-from app.routers.events import verify_event_ownership
+from app.routers.events import check_event_ownership, verify_event_ownership
 from app.models.auth import MessageResponse
 from app.services.email import email_service
-from app.services.cloudinary import delete_image
+from app.services.cloudinary import delete_image, delete_images, public_id_from_url
+from app.crud import (
+    adjust_approved_photo_count,
+    encode_photo_cursor,
+    get_page_with_total,
+    get_photo_keyset_page,
+    release_upload_bytes,
+    release_photos_upload_bytes,
+)
+from app.services.event_cache import invalidate_host_events
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/events", tags=["photos"])
 
+
+def _delete_cloudinary_images(public_ids: List[str]) -> None:
+    """
+    Delete images from Cloudinary in batched Admin API calls.
+    A failure is logged and never blocks removing the photos from the database.
+    """
+    if not public_ids:
+        return
+    try:
+        delete_images(public_ids)
+    except Exception as e:
+        logger.error(f"Failed to delete {len(public_ids)} image(s) from Cloudinary: {e}")
+
+
+def get_owned_photo(db: Session, event_id: str, photo_id: str, user_id: str) -> PhotoModel:
+    """
+    Fetch a photo joined with its event's name and host in one query, and verify the user owns the event.
+    Only when no photo matches is the event checked on its own, so a missing event (404) or another
+    host's event (403) is still reported as such rather than as a missing photo.
+    """
+    photo = db.execute(
+        select(PhotoModel)
+        .options(joinedload(PhotoModel.event, innerjoin=True).load_only(EventModel.name, EventModel.host_id))
+        .where(PhotoModel.id == photo_id, PhotoModel.event_id == event_id)
+    ).scalar_one_or_none()
+    if not photo:
+        verify_event_ownership(db, event_id, user_id)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Photo with ID '{photo_id}' not found in event '{event_id}'."
+        )
+    check_event_ownership(photo.event, event_id, user_id)
+    return photo
+
+
+def paginate_photos(query: SAQuery, page: int, page_size: int, cursor: Optional[str]) -> PhotoListResponse:
+    """
+    Build a photo listing page in (uploaded_at DESC, id DESC) order.
+    With a cursor, the page is fetched by keyset (seek) pagination; otherwise `page` is used
+    with OFFSET, for clients that haven't moved to cursors yet. Both return a next_cursor.
+    Cursor pages leave `total` unset: counting every matching photo on each page would undo
+    the point of seeking, so clients take the total from the first (cursorless) page.
+    """
+    query = query.order_by(PhotoModel.uploaded_at.desc(), PhotoModel.id.desc())
+    if cursor is not None:
+        try:
+            photos, next_cursor = get_photo_keyset_page(query, cursor, page_size)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor."
+            )
+        return PhotoListResponse(
+            photos=photos,
+            page=page,
+            page_size=page_size,
+            has_more=next_cursor is not None,
+            next_cursor=next_cursor
+        )
+
+    offset = (page - 1) * page_size
+    photos, total_photos = get_page_with_total(query, offset, page_size)
+    has_more = (offset + len(photos)) < total_photos
+    return PhotoListResponse(
+        photos=photos,
+        total=total_photos,
+        page=page,
+        page_size=page_size,
+        has_more=has_more,
+        next_cursor=encode_photo_cursor(photos[-1]) if has_more and photos else None
+    )
+
 # --- Host Moderation Endpoints ---
 
 @router.get("/{event_id}/photos", response_model=PhotoListResponse)
-async def get_event_photos(
+def get_event_photos(
     event_id: str,
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor; takes precedence over page"),
     user: Dict[str, Any] = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -44,84 +127,71 @@ async def get_event_photos(
     verify_event_ownership(db, event_id, user["uid"])
     
     query = db.query(PhotoModel).filter(PhotoModel.event_id == event_id)
-    total_photos = query.count()
-    
-    offset = (page - 1) * page_size
-    photos = query.offset(offset).limit(page_size).all()
-    
-    return PhotoListResponse(
-        photos=photos,
-        total=total_photos,
-        page=page,
-        page_size=page_size,
-        has_more=(offset + len(photos)) < total_photos
-    )
+    return paginate_photos(query, page, page_size, cursor)
 
 @router.patch("/{event_id}/photos/{photo_id}", response_model=PhotoResponse)
-async def update_photo(
+def update_photo(
     event_id: str,
     photo_id: str,
     request: UpdatePhotoRequest,
+    background_tasks: BackgroundTasks,
     user: Dict[str, Any] = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Update metadata (caption, approval status) for a specific photo within an event.
     """
-    verify_event_ownership(db, event_id, user["uid"])
+    photo = get_owned_photo(db, event_id, photo_id, user["uid"])
+    event_name, event_host_id = photo.event.name, photo.event.host_id
     
-    # Get event for email context
-    event = db.query(EventModel).filter(EventModel.id == event_id).first()
-    if not event:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Event with ID '{event_id}' not found."
-        )
+    # Only apply fields whose value actually differs; a no-op PATCH writes nothing and sends no email
+    changes = {key: value for key, value in request.dict(exclude_unset=True).items() if getattr(photo, key) != value}
+    if not changes:
+        return photo
     
-    photo = db.query(PhotoModel).filter(PhotoModel.id == photo_id, PhotoModel.event_id == event_id).first()
-    if not photo:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Photo with ID '{photo_id}' not found in event '{event_id}'."
-        )
-    
-    # Track if approval status changed
-    old_approved_status = photo.approved
-    update_data = request.dict(exclude_unset=True)
-    for key, value in update_data.items():
+    approval_flipped = False
+    if 'approved' in changes:
+        # Flip the flag with a conditional UPDATE so that when two requests race to set the same
+        # value, only the one that actually changed the row adjusts the event's approved counter
+        approved = changes.pop('approved')
+        approval_flipped = db.execute(
+            update(PhotoModel)
+            .where(PhotoModel.id == photo_id, PhotoModel.approved != approved)
+            .values(approved=approved)
+        ).rowcount == 1
+        if approval_flipped:
+            adjust_approved_photo_count(db, event_id, 1 if approved else -1)
+    for key, value in changes.items():
         setattr(photo, key, value)
     
     db.commit()
-    db.refresh(photo)
     
     # Send email notification if approval status changed and photo was uploaded by a public user
-    if 'approved' in update_data and photo.uploaded_by and photo.uploaded_by != event.host_id:
-        try:
-            # Check if approval status actually changed
-            if old_approved_status != photo.approved:
-                if photo.approved:
-                    # Photo was approved
-                    email_service.send_photo_approved_email(
-                        user_email=photo.uploaded_by,  # Assuming uploaded_by contains email
-                        event_name=event.name,
-                        photo_url=photo.url,
-                        user_name=None
-                    )
-                else:
-                    # Photo was rejected/unapproved
-                    email_service.send_photo_rejected_email(
-                        user_email=photo.uploaded_by,
-                        event_name=event.name,
-                        reason=None,
-                        user_name=None
-                    )
-        except Exception as e:
-            logger.warning(f"Failed to send photo notification email: {e}")
+    # The email is sent after the response goes out; email_service logs its own failures
+    if approval_flipped and photo.uploaded_by and photo.uploaded_by != event_host_id:
+        if photo.approved:
+            # Photo was approved
+            background_tasks.add_task(
+                email_service.send_photo_approved_email,
+                user_email=photo.uploaded_by,  # Assuming uploaded_by contains email
+                event_name=event_name,
+                photo_url=photo.url,
+                user_name=None
+            )
+        else:
+            # Photo was rejected/unapproved
+            background_tasks.add_task(
+                email_service.send_photo_rejected_email,
+                user_email=photo.uploaded_by,
+                event_name=event_name,
+                reason=None,
+                user_name=None
+            )
     
     return photo
 
 @router.delete("/{event_id}/photos/{photo_id}", response_model=MessageResponse)
-async def delete_photo(
+def delete_photo(
     event_id: str,
     photo_id: str,
     user: Dict[str, Any] = Depends(get_current_user),
@@ -130,20 +200,11 @@ async def delete_photo(
     """
     Delete a single photo from an event.
     """
-    verify_event_ownership(db, event_id, user["uid"])
+    photo = get_owned_photo(db, event_id, photo_id, user["uid"])
     
-    photo = db.query(PhotoModel).filter(PhotoModel.id == photo_id, PhotoModel.event_id == event_id).first()
-    if not photo:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Photo with ID '{photo_id}' not found in event '{event_id}'."
-        )
-    
-    # Extract public_id from Cloudinary URL
-    # Assuming URL format like: https://res.cloudinary.com/<cloud_name>/image/upload/v<version>/<public_id>.<extension>
+    # Older photos have no stored public_id; derive it from the Cloudinary URL
     try:
-        public_id = "/".join(photo.url.split('/')[-2:]).split('.')[0]
-        delete_image(public_id)
+        delete_image(photo.public_id or public_id_from_url(photo.url))
     except Exception as e:
         logger.error(f"Failed to delete image from Cloudinary for photo {photo_id}: {e}")
         # Decide whether to raise an HTTPException or just log and proceed.
@@ -153,13 +214,24 @@ async def delete_photo(
         #     detail=f"Failed to delete image from storage: {str(e)}"
         # )
     
-    db.delete(photo)
+    # Use the row as it is at delete time, so an approval that raced in after we loaded
+    # the photo is still taken off the event's counter
+    deleted = db.execute(
+        delete(PhotoModel)
+        .where(PhotoModel.id == photo_id)
+        .returning(PhotoModel.uploaded_by, PhotoModel.file_size, PhotoModel.approved)
+    ).first()
+    if deleted:
+        release_upload_bytes(db, deleted.uploaded_by, deleted.file_size)
+        if deleted.approved:
+            adjust_approved_photo_count(db, event_id, -1)
     db.commit()
+    invalidate_host_events(user["uid"])
     
     return MessageResponse(message=f"Photo '{photo_id}' deleted successfully from event '{event_id}'.")
 
 @router.post("/{event_id}/photos/bulk-delete", response_model=MessageResponse)
-async def bulk_delete_photos(
+def bulk_delete_photos(
     event_id: str,
     request: BulkDeleteRequest,
     user: Dict[str, Any] = Depends(get_current_user),
@@ -170,31 +242,28 @@ async def bulk_delete_photos(
     """
     verify_event_ownership(db, event_id, user["uid"])
     
-    query = db.query(PhotoModel).filter(
-        PhotoModel.id.in_(request.photo_ids),
-        PhotoModel.event_id == event_id
-    )
-    
-    # Fetch photos to get their Cloudinary URLs
-    photos_to_delete = query.all()
+    # Delete the rows and get back only the columns needed for quota and Cloudinary cleanup
+    deleted_photos = db.execute(
+        delete(PhotoModel)
+        .where(PhotoModel.id.in_(request.photo_ids), PhotoModel.event_id == event_id)
+        .returning(PhotoModel.public_id, PhotoModel.url, PhotoModel.uploaded_by, PhotoModel.file_size, PhotoModel.approved)
+    ).all()
+    deleted_count = len(deleted_photos)
     
-    for photo in photos_to_delete:
-        try:
-            public_id = "/".join(photo.url.split('/')[-2:]).split('.')[0]
-            delete_image(public_id)
-        except Exception as e:
-            logger.error(f"Failed to delete image from Cloudinary for photo {photo.id}: {e}")
-            # Log the error but continue with other deletions and DB record deletion
-            
-    deleted_count = query.delete(synchronize_session=False)
+    release_photos_upload_bytes(db, deleted_photos)
+    adjust_approved_photo_count(db, event_id, -sum(1 for photo in deleted_photos if photo.approved))
     db.commit()
+    invalidate_host_events(user["uid"])
+    
+    # Delete from Cloudinary in batches; failures are logged and the DB records are removed regardless
+    _delete_cloudinary_images([photo.public_id or public_id_from_url(photo.url) for photo in deleted_photos])
             
     return MessageResponse(
         message=f"Successfully deleted {deleted_count} photo(s) from event '{event_id}'."
     )
 
 @router.post("/{event_id}/photos/bulk-download", response_model=MessageResponse)
-async def bulk_download_photos(
+def bulk_download_photos(
     event_id: str,
     request: BulkDownloadRequest,
     user: Dict[str, Any] = Depends(get_current_user),
@@ -14,20 +14,21 @@ from app.models.auth import (
     UpdateProfileRequest,
     MessageResponse,
 )
-from app.dependencies import get_current_user
+from app.dependencies import get_current_user, get_current_host
 from app.services.firebase import verify_firebase_token
 from app.database import get_db
-from app.crud import get_or_create_user, get_user_upload_size
-from app.services.cloudinary import upload_image, delete_image
+from app.models.user import User as UserModel
+from app.crud import get_user_upload_size, reserve_upload_bytes, release_upload_bytes
+from app.services.cloudinary import upload_image, delete_image, get_upload_size, public_id_from_url
 
 router = APIRouter(prefix="/me", tags=["me"])
 
 # Protected routes (require authentication)
 
 @router.get("", response_model=UserResponse)
-async def get_current_user_profile(
+def get_current_user_profile(
     user: Dict[str, Any] = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db_user: UserModel = Depends(get_current_host)
 ):
     """
     Get current host profile from the database.
@@ -43,16 +44,16 @@ async def get_current_user_profile(
 
 
 @router.patch("", response_model=UserResponse)
-async def update_profile(
+def update_profile(
     request: UpdateProfileRequest,
     user: Dict[str, Any] = Depends(get_current_user),
+    db_user: UserModel = Depends(get_current_host),
     db: Session = Depends(get_db)
 ):
     """
     Update profile settings (e.g., name) in the database.
     """
-    db_user = get_or_create_user(db, user)
-    
+
     if request.name is not None:
         db_user.name = request.name
     if request.avatar_url is not None:
@@ -61,7 +62,6 @@ async def update_profile(
         db_user.avatar_thumbnail_url = request.avatar_thumbnail_url
         
     db.commit()
-    db.refresh(db_user)
     
     return UserResponse(
         uid=db_user.id,
@@ -74,15 +74,15 @@ async def update_profile(
 
 
 @router.post("/avatar", response_model=UserResponse)
-async def upload_avatar(
+def upload_avatar(
     file: UploadFile = File(...),
     user: Dict[str, Any] = Depends(get_current_user),
+    db_user: UserModel = Depends(get_current_host),
     db: Session = Depends(get_db)
 ):
     """
     Upload or replace the user's avatar.
     """
-    db_user = get_or_create_user(db, user)
 
     # Validate file type
     if not file.content_type or not file.content_type.startswith('image/'):
@@ -91,15 +91,18 @@ async def upload_avatar(
             detail="File must be an image."
         )
 
-    # Read file content to get size
-    file_content = await file.read()
-    file_size = len(file_content)
-    await file.seek(0)  # Reset file pointer
+    # Size is known from the parsed upload; no need to read the file into memory
+    file_size = get_upload_size(file)
+    if file_size == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File is empty."
+        )
 
     # Check upload limit
     MAX_UPLOAD_SIZE_PER_USER = 1 * 1024 * 1024 * 1024  # 1GB
-    current_upload_size = get_user_upload_size(db, user["uid"])
-    if current_upload_size + file_size > MAX_UPLOAD_SIZE_PER_USER:
+    if not reserve_upload_bytes(db, db_user.id, file_size, MAX_UPLOAD_SIZE_PER_USER):
+        current_upload_size = get_user_upload_size(db, db_user.id)
         raise HTTPException(
             status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
             detail=f"Upload limit exceeded. You have {round(current_upload_size / (1024*1024*1024), 2)}GB uploaded. Max allowed is 1GB."
@@ -108,8 +111,7 @@ async def upload_avatar(
     # Delete old avatar if it exists
     if db_user.avatar_url:
         try:
-            public_id = "/".join(db_user.avatar_url.split('/')[-2:]).split('.')[0]
-            delete_image(public_id)
+            delete_image(public_id_from_url(db_user.avatar_url))
         except Exception as e:
             # Log the error but don't block the upload of the new avatar
             print(f"Could not delete old avatar: {e}")
@@ -130,11 +132,16 @@ async def upload_avatar(
                 {'width': 150, 'height': 150, 'crop': 'fill'}
             ]
         )
+        # The replaced avatar no longer counts towards the quota
+        release_upload_bytes(db, db_user.id, db_user.avatar_file_size)
         db_user.avatar_file_size = file_size
         db.commit()
-        db.refresh(db_user)
         
     except Exception as e:
+        # Give back the bytes reserved for this upload
+        db.rollback()
+        release_upload_bytes(db, db_user.id, file_size)
+        db.commit()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"An error occurred during avatar upload: {str(e)}"
@@ -152,7 +159,7 @@ async def upload_avatar(
 
 
 @router.patch("/password", response_model=MessageResponse)
-async def change_password(
+def change_password(
     request: TokenRequest,
     user: Dict[str, Any] = Depends(get_current_user)
 ):
@@ -4,7 +4,9 @@ Public router - handles all /public/* endpoints for visitor access.
 from fastapi import APIRouter, Depends, HTTPException, status, Query, File, UploadFile, Form
 from typing import Dict, Any, List, Optional
 from sqlalchemy.orm import Session
+import hmac
 import uuid
+from uuid6 import uuid7
 
 from app.models.event import (
     PublicEventResponse,
@@ -17,12 +19,18 @@ from app.models.photo import (
 )
 from app.models.auth import MessageResponse
 from app.database import get_db
-from app.services.cloudinary import upload_image
-from app.crud import get_user_upload_size
+from app.services.cloudinary import upload_image, get_upload_size
+from app.crud import get_user_upload_size, reserve_upload_bytes, release_upload_bytes
+from app.routers.photos import paginate_photos
+from app.services.event_cache import invalidate_host_events
 import cloudinary
 
 router = APIRouter(prefix="/public", tags=["public"])
 
+# Image types accepted for public photo uploads
+_ALLOWED_IMAGE_TYPES = frozenset({"image/jpeg", "image/png", "image/webp", "image/heic", "image/gif"})
+_MAX_PUBLIC_UPLOAD_SIZE = 10 * 1024 * 1024  # 10MB
+
 
 
 def get_event_by_slug(db: Session, slug: str) -> EventModel:
@@ -52,12 +60,13 @@ def verify_event_password(event: EventModel, password: str) -> bool:
     if not event.password:
         return True  # No password required
     
-    # Simple password comparison (in production, use hashing)
-    return event.password == password
+    # Constant-time comparison, so response timing doesn't leak how much of the password matched
+    # (still plaintext at rest; in production, use hashing)
+    return hmac.compare_digest(event.password.encode(), password.encode())
 
 
 @router.get("/events/{slug}", response_model=PublicEventResponse)
-async def get_public_event_info(
+def get_public_event_info(
     slug: str,
     db: Session = Depends(get_db)
 ):
@@ -67,12 +76,6 @@ async def get_public_event_info(
     """
     event = get_event_by_slug(db, slug)
     
-    # Count approved photos only
-    approved_photo_count = db.query(PhotoModel).filter(
-        PhotoModel.event_id == event.id,
-        PhotoModel.approved == True
-    ).count()
-    
     return PublicEventResponse(
         id=event.id,
         name=event.name,
@@ -80,16 +83,17 @@ async def get_public_event_info(
         date=event.date,
         cover_image_url=event.cover_image_url,
         has_password=event.password is not None,
-        photo_count=approved_photo_count,
+        photo_count=event.approved_photo_count,  # Approved photos only
         is_active=event.is_active
     )
 
 
 @router.get("/events/{slug}/photos", response_model=PhotoListResponse)
-async def get_public_event_photos(
+def get_public_event_photos(
     slug: str,
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor; takes precedence over page"),
     db: Session = Depends(get_db)
 ):
     """
@@ -102,24 +106,12 @@ async def get_public_event_photos(
     query = db.query(PhotoModel).filter(
         PhotoModel.event_id == event.id,
         PhotoModel.approved == True
-    ).order_by(PhotoModel.uploaded_at.desc())
-    
-    total_photos = query.count()
-    
-    offset = (page - 1) * page_size
-    photos = query.offset(offset).limit(page_size).all()
-    
-    return PhotoListResponse(
-        photos=photos,
-        total=total_photos,
-        page=page,
-        page_size=page_size,
-        has_more=(offset + len(photos)) < total_photos
     )
+    return paginate_photos(query, page, page_size, cursor)
 
 
 @router.post("/events/{slug}/verify-password", response_model=MessageResponse)
-async def verify_event_password_endpoint(
+def verify_event_password_endpoint(
     slug: str,
     password: str = Form(...),
     db: Session = Depends(get_db)
@@ -143,7 +135,7 @@ async def verify_event_password_endpoint(
 
 
 @router.post("/events/{slug}/photos", response_model=PhotoResponse)
-async def upload_public_photo(
+def upload_public_photo(
     slug: str,
     file: UploadFile = File(...),
     caption: Optional[str] = Form(None),
@@ -157,6 +149,27 @@ async def upload_public_photo(
     Note: File storage integration is still a placeholder.
     The file will be validated but actual storage upload needs to be implemented.
     """
+    # Validate the file first: these checks need no database access, so bad uploads are rejected cheaply
+    if file.content_type not in _ALLOWED_IMAGE_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="File must be a JPEG, PNG, WebP, HEIC or GIF image."
+        )
+    
+    # Validate file size (e.g., max 10MB) without reading the upload into memory
+    file_size = get_upload_size(file)
+    if file_size > _MAX_PUBLIC_UPLOAD_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="File size exceeds maximum allowed size (10MB)."
+        )
+    
+    if file_size == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File is empty."
+        )
+    
     event = get_event_by_slug(db, slug)
     
     # Verify password if required
@@ -172,43 +185,16 @@ async def upload_public_photo(
                 detail="Incorrect password."
             )
     
-    # Validate file type
-    if not file.content_type or not file.content_type.startswith('image/'):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="File must be an image."
-        )
-    
-    # Validate file size (e.g., max 10MB)
-    file_content = await file.read()
-    file_size = len(file_content)
-    max_size = 10 * 1024 * 1024  # 10MB
-    
-    if file_size > max_size:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="File size exceeds maximum allowed size (10MB)."
-        )
-    
-    if file_size == 0:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="File is empty."
-        )
-    
     # Check upload limit against the event host
     MAX_UPLOAD_SIZE_PER_USER = 1 * 1024 * 1024 * 1024  # 1GB
     host_id = event.host_id
-    current_upload_size = get_user_upload_size(db, host_id)
-    if current_upload_size + file_size > MAX_UPLOAD_SIZE_PER_USER:
+    if not reserve_upload_bytes(db, host_id, file_size, MAX_UPLOAD_SIZE_PER_USER):
+        current_upload_size = get_user_upload_size(db, host_id)
         raise HTTPException(
             status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
             detail=f"Host's upload limit exceeded. The host has {round(current_upload_size / (1024*1024*1024), 2)}GB uploaded. Max allowed is 1GB."
         )
 
-    # Reset file pointer after reading
-    await file.seek(0)
-    
     # Upload file to Cloudinary
     try:
         upload_result = upload_image(file)
@@ -226,6 +212,9 @@ async def upload_public_photo(
             ]
         )
     except Exception as e:
+        # Give back the bytes reserved for this upload
+        release_upload_bytes(db, host_id, file_size)
+        db.commit()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"An error occurred during file upload: {str(e)}"
@@ -234,7 +223,7 @@ async def upload_public_photo(
     # Create photo record in database
     # Photos uploaded by public visitors start as unapproved (approved=False)
     new_photo = PhotoModel(
-        id=str(uuid.uuid4()),
+        id=str(uuid7()),  # Time-ordered, keeps primary key inserts append-only
         event_id=event.id,
         url=file_url,
         thumbnail_url=thumbnail_url,
@@ -243,11 +232,13 @@ async def upload_public_photo(
         uploaded_by=host_id,  # Associate with the host for quota tracking
         public_uploader_identifier=str(uuid.uuid4()), # Unique ID for the anonymous uploader
         file_size=file_size,
+        public_id=upload_result["public_id"],
     )
     
     db.add(new_photo)
     db.commit()
-    db.refresh(new_photo)
+    # The host's event photo counts changed
+    invalidate_host_events(host_id)
     
     return new_photo
 
@@ -2,15 +2,36 @@
 Cloudinary service for handling image uploads.
 """
 import cloudinary
+import cloudinary.api
+import cloudinary.api_client.call_api
 import cloudinary.uploader
+import cloudinary.utils
+from typing import Dict, List
 from fastapi import UploadFile, HTTPException, status
 from app.config import settings
 import logging
+import os
+import re
+
+# Cloudinary's Admin API deletes at most this many public IDs per call
+_DELETE_BATCH_SIZE = 100
+# Uploads are streamed from the spooled temp file in parts of this size
+_UPLOAD_CHUNK_SIZE = 6 * 1024 * 1024
+# Connections kept alive per Cloudinary host; sized for the worker threadpool's concurrent calls
+_HTTP_POOL_MAXSIZE = 32
+# The optional version segment Cloudinary puts in front of the public ID in delivery URLs
+_VERSION_SEGMENT = re.compile(r"v\d+/")
 
 logger = logging.getLogger(__name__)
 
+# Set once Cloudinary has been configured successfully; the settings never change at runtime
+_configured = False
+
 def _configure_cloudinary():
     """Configure Cloudinary if not already configured."""
+    global _configured
+    if _configured:
+        return
     if not settings.cloudinary_url:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -42,6 +63,7 @@ def _configure_cloudinary():
                 raise ValueError("Invalid Cloudinary URL format: missing cloud_name")
         else:
             logger.info("Cloudinary configured successfully using URL")
+        _configured = True
     except Exception as e:
         logger.error(f"Failed to configure Cloudinary: {e}")
         raise HTTPException(
@@ -49,14 +71,47 @@ def _configure_cloudinary():
             detail=f"Failed to configure Cloudinary: {str(e)}. Please check your CLOUDINARY_URL format."
         )
 
+def _use_pooled_http_connectors() -> None:
+    """
+    Replace the SDK's module-level HTTP connectors (one for the Upload API, one for the Admin API)
+    with ones that keep up to _HTTP_POOL_MAXSIZE connections alive per host. urllib3's default
+    keeps one, so concurrent uploads and deletes each paid for a fresh TCP + TLS handshake.
+
+    The `_http` attributes are SDK internals (see the cloudinary pin in requirements.txt);
+    if a release drops one, that module keeps the SDK's default connector.
+    """
+    options = {**cloudinary.CERT_KWARGS, "maxsize": _HTTP_POOL_MAXSIZE, "block": False}
+    for module in (cloudinary.uploader, cloudinary.api_client.call_api):
+        if not hasattr(module, "_http"):
+            logger.warning(f"{module.__name__}._http not found; keeping the default Cloudinary HTTP connector")
+            continue
+        module._http = cloudinary.utils.get_http_connector(cloudinary.config(), options)
+
 # Configure Cloudinary on module import
 if settings.cloudinary_url:
     _configure_cloudinary()
+_use_pooled_http_connectors()
+
+
+def get_upload_size(file: UploadFile) -> int:
+    """
+    Returns the size of an uploaded file in bytes without reading it into memory.
+
+    Starlette records the size while parsing the multipart body; if it is missing,
+    the size is taken by seeking to the end of the spooled file.
+    """
+    if file.size is not None:
+        return file.size
+    position = file.file.tell()
+    size = file.file.seek(0, os.SEEK_END)
+    file.file.seek(position)
+    return size
 
 
 def upload_image(file: UploadFile, public_id: str = None) -> dict:
     """
-    Uploads an image to Cloudinary.
+    Uploads an image to Cloudinary, streaming it from the spooled upload file in chunks
+    so at most one chunk is held in memory. Blocking; call it from a worker thread.
 
     Args:
         file: The image file to upload (FastAPI UploadFile).
@@ -68,20 +123,20 @@ def upload_image(file: UploadFile, public_id: str = None) -> dict:
     Raises:
         HTTPException: If Cloudinary is not configured or upload fails.
     """
-    # Ensure Cloudinary is configured before upload
+    # Ensure Cloudinary is configured before upload (a no-op once configured at import)
     _configure_cloudinary()
     
     if not file:
         return None
     
     try:
-        # The file needs to be read into memory before uploading
         # Reset file pointer to beginning in case it was already read
         file.file.seek(0)
-        file_content = file.file.read()
         
-        upload_result = cloudinary.uploader.upload(
-            file_content,
+        upload_result = cloudinary.uploader.upload_large(
+            file.file,
+            filename=file.filename or "upload",
+            chunk_size=_UPLOAD_CHUNK_SIZE,
             public_id=public_id,
             overwrite=True  # Overwrite if an image with the same public_id exists
         )
@@ -97,6 +152,18 @@ def upload_image(file: UploadFile, public_id: str = None) -> dict:
             detail=f"Failed to upload image to Cloudinary: {error_msg}"
         )
 
+def public_id_from_url(url: str) -> str:
+    """
+    Derives a Cloudinary public ID from a delivery URL, for records that predate storing it.
+    Handles URLs of the form .../upload/[v<version>/]<folders>/<name>[.<extension>].
+    """
+    path = url.rpartition("/upload/")[2]
+    if _VERSION_SEGMENT.match(path):
+        path = path.partition("/")[2]
+    stem, dot, extension = path.rpartition(".")
+    return stem if dot and "/" not in extension else path
+
+
 def delete_image(public_id: str) -> dict:
     """
     Deletes an image from Cloudinary by its public ID.
@@ -112,3 +179,20 @@ def delete_image(public_id: str) -> dict:
     
     deletion_result = cloudinary.uploader.destroy(public_id)
     return deletion_result
+
+
+def delete_images(public_ids: List[str]) -> Dict[str, str]:
+    """
+    Deletes images from Cloudinary in batches through the Admin API,
+    one request per 100 public IDs instead of one per image.
+
+    Args:
+        public_ids: The public IDs of the images to delete.
+
+    Returns:
+        A dictionary mapping each public ID to its deletion status (e.g. "deleted", "not_found").
+    """
+    results: Dict[str, str] = {}
+    for i in range(0, len(public_ids), _DELETE_BATCH_SIZE):
+        results.update(cloudinary.api.delete_resources(public_ids[i:i + _DELETE_BATCH_SIZE])["deleted"])
+    return results
@@ -0,0 +1,52 @@
+"""
+In-process cache of rendered host event responses (event list pages and event details).
+
+Versions live in this process only, so a write handled by one worker doesn't invalidate
+another worker's cache. The cache is therefore off unless EVENT_CACHE_ENABLED is set,
+which is only safe with a single worker process.
+"""
+from typing import Dict, Optional
+import threading
+
+from app.config import settings
+from app.services.ttl_cache import BoundedTTLCache
+
+# Cached bodies are keyed by host, the host's current version and the page/event being
+# rendered. Any write to one of the host's events bumps the version, which orphans every
+# cached body for that host at once; the TTL bounds staleness across worker processes.
+_EVENT_CACHE_TTL_SECONDS = 30
+_EVENT_CACHE_MAX_SIZE = 10_000
+_host_versions: Dict[str, int] = {}
+_host_versions_lock = threading.Lock()
+_event_cache: BoundedTTLCache[bytes] = BoundedTTLCache(_EVENT_CACHE_MAX_SIZE, _EVENT_CACHE_TTL_SECONDS)
+
+
+def get_host_version(host_id: str) -> int:
+    """
+    Returns the host's current cache version.
+    Read it before querying the database and pass it to cache_event_body, so a write
+    that lands in between can't leave a stale body cached under the new version.
+    """
+    return _host_versions.get(host_id, 0)
+
+
+def get_cached_event_body(host_id: str, version: int, *key: object) -> Optional[bytes]:
+    """Returns the cached JSON body for this host/version/key, if present and fresh."""
+    if not settings.event_cache_enabled:
+        return None
+    return _event_cache.get((host_id, version, *key))
+
+
+def cache_event_body(host_id: str, version: int, body: bytes, *key: object) -> None:
+    """Stores a rendered JSON body. Evicts the oldest entry when the cache is full."""
+    if not settings.event_cache_enabled:
+        return
+    _event_cache.set((host_id, version, *key), body)
+
+
+def invalidate_host_events(host_id: Optional[str]) -> None:
+    """Drops every cached event body for the host by bumping its version."""
+    if not host_id:
+        return
+    with _host_versions_lock:
+        _host_versions[host_id] = _host_versions.get(host_id, 0) + 1
@@ -5,51 +5,111 @@ import firebase_admin
 from firebase_admin import credentials, auth
 from fastapi import HTTPException, status
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+import hashlib
 import logging
+import threading
+import time
 
-from app.config import get_firebase_credentials_path
+from app.config import settings, get_firebase_credentials_path
+from app.services.ttl_cache import BoundedTTLCache
 
 logger = logging.getLogger(__name__)
 
 # Global variable to track if Firebase is initialized
 _firebase_initialized = False
+_firebase_init_lock = threading.Lock()
+
+# Cache of verified tokens: blake2b(token) -> user info, expiring on the token's own wall-clock exp.
+# Avoids re-verifying the RSA signature of the same ID token on every request.
+_TOKEN_CACHE_MAX_SIZE = 10_000
+_TOKEN_EXPIRY_MARGIN_SECONDS = 30
+_token_cache: BoundedTTLCache[Dict[str, Any]] = BoundedTTLCache(_TOKEN_CACHE_MAX_SIZE, clock=time.time)
+
+
+def _token_cache_key(token: str) -> bytes:
+    """Hash the token so raw credentials are never kept in memory as cache keys."""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def _cache_verified_token(key: bytes, user_info: Dict[str, Any], token_exp: float) -> None:
+    """
+    Store verified user info until shortly before the token's own expiry, so each
+    token is verified once per lifetime. Evicts the oldest entry when the cache is full.
+    """
+    ttl_seconds = token_exp - _TOKEN_EXPIRY_MARGIN_SECONDS - time.time()
+    if ttl_seconds <= 0:
+        return
+    _token_cache.set(key, user_info, ttl_seconds)
 
 
 def initialize_firebase() -> None:
     """
     Initialize Firebase Admin SDK using service account credentials.
-    This should be called once at application startup.
+    This should be called once at application startup; it is safe to call
+    concurrently from worker threads.
     """
     global _firebase_initialized
     
-    if _firebase_initialized:
-        logger.info("Firebase Admin SDK already initialized")
-        return
+    with _firebase_init_lock:
+        if _firebase_initialized:
+            logger.info("Firebase Admin SDK already initialized")
+            return
+        
+        try:
+            cred_path = get_firebase_credentials_path()
+            
+            if not cred_path.exists():
+                raise FileNotFoundError(
+                    f"Firebase credentials file not found at {cred_path}. "
+                    "Please download your service account JSON from Firebase Console."
+                )
+            
+            # Initialize Firebase Admin SDK
+            cred = credentials.Certificate(str(cred_path))
+            firebase_admin.initialize_app(cred)
+            _firebase_initialized = True
+            logger.info("Firebase Admin SDK initialized successfully")
+            
+        except Exception as e:
+            logger.error(f"Failed to initialize Firebase Admin SDK: {e}")
+            raise
+
+
+def warm_firebase_public_keys() -> None:
+    """
+    Prefetch Google's ID token signing certificates so the first authenticated
+    request doesn't pay for the HTTPS round-trip.
     
+    firebase-admin already keeps these certificates in an HTTP cache that honours
+    the Cache-Control max-age Google sends, so only the cold fetch is worth saving.
+    The fetch goes through the SDK's own cached transport; failures are logged and
+    ignored since verification will simply fetch the keys on demand.
+    """
     try:
-        cred_path = get_firebase_credentials_path()
-        
-        if not cred_path.exists():
-            raise FileNotFoundError(
-                f"Firebase credentials file not found at {cred_path}. "
-                "Please download your service account JSON from Firebase Console."
-            )
-        
-        # Initialize Firebase Admin SDK
-        cred = credentials.Certificate(str(cred_path))
-        firebase_admin.initialize_app(cred)
-        _firebase_initialized = True
-        logger.info("Firebase Admin SDK initialized successfully")
-        
+        # Private firebase-admin internals; requirements.txt pins 7.7.x, which this matches.
+        # Any breakage on upgrade lands in the except below and only skips the prefetch.
+        from firebase_admin import _token_gen
+
+        verifier = auth._get_client(None)._token_verifier
+        verifier.request(url=_token_gen.ID_TOKEN_CERT_URI, method="GET")
+        logger.info("Firebase public keys prefetched")
     except Exception as e:
-        logger.error(f"Failed to initialize Firebase Admin SDK: {e}")
-        raise
+        logger.warning(f"Could not prefetch Firebase public keys: {e}")
+
+
+def get_cached_firebase_user(token: str) -> Optional[Dict[str, Any]]:
+    """
+    Returns the user info for a token verified earlier and not yet expired, or None.
+    Never does any network or crypto work, so it's safe to call on the event loop.
+    """
+    return _token_cache.get(_token_cache_key(token))
 
 
 def verify_firebase_token(token: str) -> Dict[str, Any]:
     """
     Verify a Firebase ID token and return decoded token information.
+    Successfully verified tokens are cached until shortly before they expire.
     
     Args:
         token: Firebase ID token string
@@ -60,11 +120,16 @@ def verify_firebase_token(token: str) -> Dict[str, Any]:
         - email: User email
         - email_verified: Whether email is verified
         - name: User's display name
+        - is_admin: Whether the email is in the configured admin emails
         - firebase_claims: All claims present in the decoded token
         
     Raises:
         HTTPException: If token is invalid, expired, or revoked
     """
+    cached = get_cached_firebase_user(token)
+    if cached is not None:
+        return cached
+    
     if not _firebase_initialized:
         # This should ideally be handled at application startup, but this acts as a safeguard.
         logger.warning("Firebase Admin SDK not initialized, attempting to initialize now.")
@@ -75,14 +140,18 @@ def verify_firebase_token(token: str) -> Dict[str, Any]:
         decoded_token: Dict[str, Any] = auth.verify_id_token(token)
         
         # Extract user information
+        email = decoded_token.get("email")
         user_info = {
             "uid": decoded_token.get("uid"),
-            "email": decoded_token.get("email"),
+            "email": email,
             "email_verified": decoded_token.get("email_verified", False),
             "name": decoded_token.get("name"),
+            # Resolved once per verification and cached along with the claims
+            "is_admin": bool(email) and email.lower() in settings.admin_emails_set,
             "firebase_claims": decoded_token  # Include all claims for reference
         }
         
+        _cache_verified_token(_token_cache_key(token), user_info, decoded_token.get("exp", 0))
         return user_info
         
     except auth.InvalidIdTokenError as e:
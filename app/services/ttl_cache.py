@@ -0,0 +1,50 @@
+"""
+Small thread-safe in-process cache with per-entry expiry and a size bound.
+"""
+from typing import Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+import threading
+import time
+
+V = TypeVar("V")
+
+
+class BoundedTTLCache(Generic[V]):
+    """
+    Maps keys to values that expire after a TTL. When full, the oldest entry is evicted.
+
+    Reads are lock-free dict lookups; writes and evictions take the lock.
+    `clock` is the time source expiry is measured on (time.monotonic by default).
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: Dict[Hashable, Tuple[float, V]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """Returns the value for the key if present and not expired, otherwise None."""
+        cached = self._entries.get(key)
+        if cached is None:
+            return None
+        if cached[0] > self._clock():
+            return cached[1]
+        with self._lock:
+            self._entries.pop(key, None)
+        return None
+
+    def set(self, key: Hashable, value: V, ttl_seconds: Optional[float] = None) -> None:
+        """Stores the value for `ttl_seconds`, or the cache's default TTL if not given."""
+        ttl = self._ttl_seconds if ttl_seconds is None else ttl_seconds
+        expires_at = self._clock() + ttl
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self._max_size:
+                # Dicts preserve insertion order, so the first key is the oldest entry
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = (expires_at, value)